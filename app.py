@@ -1,36 +1,27 @@
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
 import streamlit as st
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
-
-# -------------------------
-# Helpers
-# -------------------------
-def parse_items(text: str):
-    """
-    Converts model output lines like:
-    - <target> — <english>
-    into a list of dicts: [{"front": "...", "back": "..."}, ...]
-    """
-    items = []
-    for line in text.splitlines():
-        line = line.strip()
-        if not line.startswith("- "):
-            continue
-        line = line[2:]  # remove "- "
-        if " — " not in line:
-            continue
-        left, right = line.split(" — ", 1)
-        items.append({"front": left.strip(), "back": right.strip()})
-    return items
-
-
-def norm_key(s: str) -> str:
-    """Normalize for duplicate checks (case-insensitive, trim, collapse whitespace)."""
-    return " ".join((s or "").strip().lower().split())
-
-
-def desired_count_for(generate_type: str) -> int:
-    return 10 if generate_type == "Phrases" else 20
+from palabrazo.core import (
+    CEFR_LEVELS,
+    desired_count_for,
+    max_tokens_for,
+    model_for,
+    next_level,
+    norm_key,
+    parse_items,
+    system_rules_for,
+    with_keys,
+)
 
 
 # -------------------------
@@ -46,58 +37,371 @@ tab_generate, tab_flashcards = st.tabs(["Generate", "Flashcards"])
 # Persisted state
 if "last_items" not in st.session_state:
     st.session_state["last_items"] = []
+if "topup_pool" not in st.session_state:
+    st.session_state["topup_pool"] = []
 if "last_meta" not in st.session_state:
     st.session_state["last_meta"] = {}
 if "card_index" not in st.session_state:
     st.session_state["card_index"] = 0
 if "show_back" not in st.session_state:
     st.session_state["show_back"] = False
+if "removed_keys" not in st.session_state:
+    st.session_state["removed_keys"] = set()
+if "batches" not in st.session_state:
+    st.session_state["batches"] = []
+if "batches_checked_at" not in st.session_state:
+    st.session_state["batches_checked_at"] = 0.0
+
+
+def set_current_list(items, spare_items, meta):
+    """Makes `items` the current list (spare items feed Top up) and resets the flashcards."""
+    st.session_state["last_items"] = with_keys(items)
+    st.session_state["topup_pool"] = with_keys(spare_items)
+    st.session_state["removed_keys"] = set()
+    st.session_state["last_meta"] = meta
+
+    # Reset flashcards to avoid stale indices
+    st.session_state["card_index"] = 0
+    st.session_state["show_back"] = False
 
-# OpenAI client
-client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-
-SYSTEM_RULES_TEMPLATE = """
-You are a language teacher. Generate exactly {item_count} items about the user's topic.
-
-Target language: {target_language}
-CEFR level: {cefr_level}
-Generation type: {generate_type}
-
-CEFR guidance:
-- A1/A2: very common, concrete, high-frequency language.
-- B1: practical everyday language.
-- B2: more precise language; some abstraction.
-- C1/C2: advanced, nuanced language appropriate to the topic.
-
-STRICT output format:
-- Output ONLY {item_count} lines (no intro, no headings).
-- Each line MUST start with "- " (dash + space).
-- Each line MUST be: - <target language> — <English>
-- Use " — " exactly (space em-dash space). No extra text.
-- If you cannot follow the type rules, regenerate internally until you can.
-
-Type rules (apply ONLY the matching section):
-
-[WORDS]
-- Output single-word items only (one token/word, or an article + single noun).
-- Allowed formats:
-  - Noun: article + singular noun (e.g., "el libro", "la casa"). No multi-word nouns.
-  - Verb/adjective/adverb: single word only. No article.
-- NOT allowed: phrases, collocations, multi-word items, sentences, punctuation.
-
-[VERBS]
-- Output infinitive verbs only, single word (e.g., "hablar", "comer").
-- NOT allowed: any nouns, any sentences, any multi-word items.
-
-[PHRASES]
-- Output complete, useful sentences a learner would actually say (8–14 words).
-- Each item MUST contain a verb and end with punctuation (., ?, !).
-- NOT allowed: single words, noun-only entries.
-
-Quality rules:
-- Avoid English loanwords unless they are the most common term in the target language.
-- Keep items relevant to the topic and appropriate to the CEFR level.
-"""
+
+# OpenAI client (one per process, so its connection pool survives reruns)
+@st.cache_resource
+def get_client() -> OpenAI:
+    # HTTP/2 multiplexes concurrent requests (sessions, batch polling) over one kept-alive connection.
+    http_client = DefaultHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        timeout=60,
+    )
+    return OpenAI(api_key=st.secrets["OPENAI_API_KEY"], http_client=http_client)
+
+
+# Lifetime of every cache (in-process completions/embeddings and the SQLite lists):
+# after this, Generate gives a fresh list.
+CACHE_TTL_SECONDS = 3600
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def _generate_raw(
+    model: str,
+    system_rules: str,
+    topic_key: str,
+    _user_content: str,
+    temperature: float,
+    max_tokens: int | None,
+    n: int = 1,
+) -> tuple:
+    """
+    Streams the chat completion and returns the raw text of each of the `n` choices.
+    Items of the first choice are previewed as their lines complete, so call this inside a
+    container the caller clears afterwards (a cache hit replays the finished preview).
+    Cached on (model, rules, normalized topic, temperature, max_tokens, n); the rules already
+    encode type/language/level/count (and the dedupe guard on top-up). Raises ValueError,
+    uncached, when the first choice has no parseable items.
+    """
+    stream = get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_rules},
+            {"role": "user", "content": _user_content},
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        n=n,
+        stream=True,
+    )
+
+    parts = [[] for _ in range(n)]
+    preview = st.empty()
+    pending = ""
+    shown = []
+    for chunk in stream:
+        for choice in chunk.choices:
+            delta = choice.delta.content or ""
+            parts[choice.index].append(delta)
+            if choice.index != 0 or not delta:
+                continue
+
+            pending += delta
+            if "\n" in pending:
+                complete, pending = pending.rsplit("\n", 1)
+                new_items = parse_items(complete)
+                if new_items:
+                    shown.extend(new_items)
+                    preview.markdown("\n".join(f"- {it['front']} — {it['back']}" for it in shown))
+
+    texts = tuple("".join(p) for p in parts)
+    # Raising keeps a refusal or garbled reply out of the cache, so the next click retries the model.
+    if not parse_items(texts[0]):
+        raise ValueError("the model returned no items in the expected format")
+    return texts
+
+
+# -------------------------
+# List cache (SQLite, survives restarts): exact key first, then near-duplicate topics
+# -------------------------
+CACHE_DB_PATH = Path(__file__).with_name("palabrazo_cache.db")
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_THRESHOLD = 0.92
+
+
+def _cache_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10)
+    # WAL lets concurrent sessions read while another one writes.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gen (
+            key TEXT PRIMARY KEY,
+            items_json TEXT NOT NULL,
+            spare_json TEXT NOT NULL,
+            vec BLOB,
+            created REAL NOT NULL
+        )
+        """
+    )
+    return conn
+
+
+def _key_prefix(target_language: str, cefr_level: str, generate_type: str) -> str:
+    # The model is part of the key so rows from a different routing are never served.
+    model = model_for(generate_type, cefr_level)
+    return f"{model}|{target_language}|{cefr_level}|{generate_type}|"
+
+
+def cache_key(target_language: str, cefr_level: str, generate_type: str, topic: str) -> str:
+    return f"{_key_prefix(target_language, cefr_level, generate_type)}{norm_key(topic)}"
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=1024, show_spinner=False)
+def _embed(topic_key: str) -> np.ndarray:
+    """Unit-length float32 embedding of a normalized topic."""
+    response = get_client().embeddings.create(model=EMBEDDING_MODEL, input=[topic_key])
+    vec = np.asarray(response.data[0].embedding, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def lookup_similar(target_language: str, cefr_level: str, generate_type: str, vec: np.ndarray):
+    """
+    Returns (items, spare_items, created) stored for the closest recent topic with the same
+    settings, or None. The spare items refill the top-up pool, so a hit is as good as a fresh
+    Generate; `created` lets an alias of the row keep the original's age.
+    """
+    prefix = _key_prefix(target_language, cefr_level, generate_type)
+    with closing(_cache_db()) as conn:
+        rows = conn.execute(
+            "SELECT vec, items_json, spare_json, created FROM gen"
+            " WHERE vec IS NOT NULL AND created >= ? AND substr(key, 1, ?) = ?",
+            (time.time() - CACHE_TTL_SECONDS, len(prefix), prefix),
+        ).fetchall()
+
+    if not rows:
+        return None
+
+    matrix = np.frombuffer(b"".join(r[0] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+    sims = matrix @ vec
+    best = int(np.argmax(sims))
+    if sims[best] < SEMANTIC_THRESHOLD:
+        return None
+    return json.loads(rows[best][1]), json.loads(rows[best][2]), rows[best][3]
+
+
+def store_list(key: str, items, spare_items, vec: np.ndarray | None, created: float | None = None):
+    now = time.time()
+    with closing(_cache_db()) as conn, conn:
+        conn.execute("DELETE FROM gen WHERE created < ?", (now - CACHE_TTL_SECONDS,))
+        conn.execute(
+            "INSERT OR REPLACE INTO gen (key, items_json, spare_json, vec, created) VALUES (?, ?, ?, ?, ?)",
+            (
+                key,
+                json.dumps(items),
+                json.dumps(spare_items),
+                vec.tobytes() if vec is not None else None,
+                created if created is not None else now,
+            ),
+        )
+
+
+def get_or_compute(key: str, producer):
+    """
+    Returns (items, spare_items) stored under `key` in the last CACHE_TTL_SECONDS. On a miss,
+    runs producer() -> (items, spare_items, vec, created) and stores a non-empty result; `vec`
+    (or None) feeds lookup_similar, and `created` (None for a fresh list) is the age to store.
+    """
+    try:
+        with closing(_cache_db()) as conn:
+            row = conn.execute(
+                "SELECT items_json, spare_json FROM gen WHERE key = ? AND created >= ?",
+                (key, time.time() - CACHE_TTL_SECONDS),
+            ).fetchone()
+    except sqlite3.Error:
+        row = None
+    if row is not None:
+        return json.loads(row[0]), json.loads(row[1])
+
+    items, spare_items, vec, created = producer()
+    if items:
+        try:
+            store_list(key, items, spare_items, vec, created)
+        except sqlite3.Error:
+            pass
+    return items, spare_items
+
+
+def generate_list(target_language: str, cefr_level: str, generate_type: str, topic: str):
+    """
+    Produces (items, spare_items, vec, created) for get_or_compute: a near-duplicate topic from
+    the cache if there is one (keeping its `created`, so aliases never extend its lifetime),
+    otherwise a fresh n=2 completion (the second choice is the top-up pool).
+    """
+    # The semantic lookup is best-effort: any failure just falls through to the model.
+    try:
+        vec = _embed(norm_key(topic))
+        hit = lookup_similar(target_language, cefr_level, generate_type, vec)
+    except Exception:
+        vec, hit = None, None
+    if hit is not None:
+        items, spare_items, created = hit
+        return items, spare_items, vec, created
+
+    item_count = desired_count_for(generate_type)
+    preview = st.empty()
+    try:
+        with preview.container():
+            raw_texts = _generate_raw(
+                model_for(generate_type, cefr_level),
+                system_rules_for(target_language, cefr_level, generate_type, item_count),
+                norm_key(topic),
+                topic,
+                temperature=0.6,
+                max_tokens=max_tokens_for(generate_type),
+                n=2,
+            )
+    finally:
+        preview.empty()
+
+    seen = set()
+    items = parse_items(raw_texts[0], seen=seen)
+    spare_items = [it for raw in raw_texts[1:] for it in parse_items(raw, seen=seen)]
+    return items, spare_items, vec, None
+
+
+# -------------------------
+# Batch prefetch (OpenAI Batch API: half price, separate rate limits, up to 24h)
+# -------------------------
+BATCH_POLL_SECONDS = 60
+BATCH_FAILED_STATUSES = ("failed", "expired", "cancelled")
+
+
+def queue_prefetch(target_language: str, cefr_level: str, generate_type: str, topic: str):
+    """Queues a list for later in st.session_state["batches"], unless the semantic cache already has one."""
+    meta = {
+        "generate_type": generate_type,
+        "target_language": target_language,
+        "cefr_level": cefr_level,
+        "topic": topic,
+    }
+
+    # Best-effort, as in generate_list: if the lookup fails, just submit the batch.
+    try:
+        hit = lookup_similar(target_language, cefr_level, generate_type, _embed(norm_key(topic)))
+    except Exception:
+        hit = None
+    if hit is not None:
+        items, spare_items, _ = hit
+        st.session_state["batches"].append(
+            {
+                "id": f"cached_{uuid.uuid4().hex}",
+                "meta": meta,
+                "status": "completed",
+                "items": items,
+                "spare_items": spare_items,
+            }
+        )
+        return
+
+    system_rules = system_rules_for(target_language, cefr_level, generate_type, desired_count_for(generate_type))
+    body = {
+        "model": model_for(generate_type, cefr_level),
+        "messages": [
+            {"role": "system", "content": system_rules},
+            {"role": "user", "content": topic},
+        ],
+        "temperature": 0.6,
+        "n": 2,
+    }
+    max_tokens = max_tokens_for(generate_type)
+    if max_tokens:
+        body["max_tokens"] = max_tokens
+
+    client = get_client()
+    line = {"custom_id": "prefetch", "method": "POST", "url": "/v1/chat/completions", "body": body}
+    batch_file = client.files.create(file=("prefetch.jsonl", json.dumps(line).encode()), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    st.session_state["batches"].append({"id": batch.id, "meta": meta, "status": batch.status})
+
+
+def poll_batches():
+    """Refreshes pending batches (at most every BATCH_POLL_SECONDS) and stores finished lists."""
+    now = time.time()
+    if now - st.session_state["batches_checked_at"] < BATCH_POLL_SECONDS:
+        return
+    st.session_state["batches_checked_at"] = now
+
+    client = get_client()
+    for b in st.session_state["batches"]:
+        if b["status"] == "completed" or b["status"] in BATCH_FAILED_STATUSES:
+            continue
+        try:
+            batch = client.batches.retrieve(b["id"])
+        except Exception:
+            continue
+
+        if batch.status != "completed":
+            b["status"] = batch.status
+            continue
+
+        # A completed batch whose one request failed has only an error file.
+        if batch.output_file_id is None:
+            b["status"] = "failed"
+            continue
+
+        # Download errors leave the entry pending, so the next poll retries it.
+        try:
+            result = json.loads(client.files.content(batch.output_file_id).text.splitlines()[0])
+            response = result["response"]
+            raw_texts = (
+                [c["message"]["content"] for c in response["body"]["choices"]]
+                if response["status_code"] == 200
+                else []
+            )
+        except Exception:
+            continue
+
+        seen = set()
+        items = parse_items(raw_texts[0], seen=seen) if raw_texts else []
+        if not items:
+            b["status"] = "failed"
+            continue
+
+        m = b["meta"]
+        b["items"] = items
+        b["spare_items"] = [it for raw in raw_texts[1:] for it in parse_items(raw, seen=seen)]
+        b["status"] = "completed"
+        try:
+            store_list(
+                cache_key(m["target_language"], m["cefr_level"], m["generate_type"], m["topic"]),
+                b["items"],
+                b["spare_items"],
+                _embed(norm_key(m["topic"])),
+            )
+        except Exception:
+            pass
 
 
 # -------------------------
@@ -118,9 +422,13 @@ with tab_generate:
             )
 
         with col3:
-            cefr_level = st.selectbox("Level", ["A1", "A2", "B1", "B2", "C1", "C2"], index=2)
+            cefr_level = st.selectbox("Level", CEFR_LEVELS, index=2)
 
         user_input = st.text_input("Topic or sentence", placeholder="e.g., Rock climbing")
+        prefetch_next = st.checkbox(
+            "Also prefetch the next level",
+            help="Queued with the OpenAI Batch API at half price; usually ready within minutes, at most 24h.",
+        )
         generate = st.form_submit_button("Generate")
 
     # --- Generate new list ---
@@ -128,46 +436,56 @@ with tab_generate:
         if not user_input.strip():
             st.warning("Please enter a topic or sentence first.")
         else:
-            item_count = desired_count_for(generate_type)
-
-            system_rules = SYSTEM_RULES_TEMPLATE.format(
-                target_language=target_language,
-                cefr_level=cefr_level,
-                generate_type=generate_type,
-                item_count=item_count,
-            )
-
-            max_tokens = 600 if generate_type == "Phrases" else 400
-
             with st.spinner("Generating..."):
                 try:
-                    response = client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": system_rules},
-                            {"role": "user", "content": user_input},
-                        ],
-                        temperature=0.6,
-                        max_tokens=max_tokens,
+                    items, spare_items = get_or_compute(
+                        cache_key(target_language, cefr_level, generate_type, user_input),
+                        lambda: generate_list(target_language, cefr_level, generate_type, user_input),
                     )
                 except Exception as e:
                     st.error(f"OpenAI request failed: {e}")
                     st.stop()
 
-            raw_text = response.choices[0].message.content
-            items = parse_items(raw_text)
-
-            st.session_state["last_items"] = items
-            st.session_state["last_meta"] = {
-                "generate_type": generate_type,
-                "target_language": target_language,
-                "cefr_level": cefr_level,
-                "topic": user_input,
-            }
+            set_current_list(
+                items,
+                spare_items,
+                {
+                    "generate_type": generate_type,
+                    "target_language": target_language,
+                    "cefr_level": cefr_level,
+                    "topic": user_input,
+                },
+            )
 
-            # Reset flashcards to avoid stale indices
-            st.session_state["card_index"] = 0
-            st.session_state["show_back"] = False
+            higher_level = next_level(cefr_level)
+            if prefetch_next and not higher_level:
+                st.info(f"{cefr_level} is the highest level, so there is no next level to prefetch.")
+            elif prefetch_next:
+                try:
+                    queue_prefetch(target_language, higher_level, generate_type, user_input)
+                except Exception as e:
+                    st.warning(f"Could not queue the {higher_level} prefetch: {e}")
+
+    # --- Prefetched lists (Batch API) ---
+    if st.session_state["batches"]:
+        poll_batches()
+        st.write("Prefetched lists")
+        for b in st.session_state["batches"]:
+            m = b["meta"]
+            label = f'{m["topic"]} • {m["target_language"]} • {m["cefr_level"]} • {m["generate_type"]}'
+            if b["status"] == "completed":
+                if st.button(f"Open {label}", key=f'open_{b["id"]}'):
+                    set_current_list(b["items"], b["spare_items"], m)
+                    st.session_state["batches"].remove(b)
+                    st.rerun()
+            elif b["status"] in BATCH_FAILED_STATUSES:
+                c1, c2 = st.columns([3, 1])
+                c1.caption(f'{label} — {b["status"]}')
+                if c2.button("Dismiss", key=f'dismiss_{b["id"]}'):
+                    st.session_state["batches"].remove(b)
+                    st.rerun()
+            else:
+                st.caption(f'{label} — {b["status"]}')
 
     # --- Show persisted results ---
     meta = st.session_state.get("last_meta", {})
@@ -206,56 +524,64 @@ with tab_generate:
                 st.caption(f"List is full ({desired_count}).")
 
         if topup_clicked and missing > 0:
-            existing = st.session_state["last_items"]
-            existing_keys = sorted({norm_key(i["front"]) for i in existing if i.get("front")})[:80]
-
-            system_rules = SYSTEM_RULES_TEMPLATE.format(
-                target_language=meta.get("target_language", target_language),
-                cefr_level=meta.get("cefr_level", cefr_level),
-                generate_type=current_type,
-                item_count=missing,
-            )
+            # Grow the session's list in place rather than copying it.
+            merged = st.session_state["last_items"]
+            # Items the user removed from this list count as seen, so Top up never brings them back.
+            removed = st.session_state["removed_keys"]
+            seen = {i["_key"] for i in merged} | removed
+
+            # Drain the spare batch generated alongside the list first; it costs no request.
+            pool = st.session_state["topup_pool"]
+            while pool and len(merged) < desired_count:
+                it = pool.pop(0)
+                k = it["_key"]
+                if k and k not in seen:
+                    seen.add(k)
+                    merged.append(it)
 
-            dedupe_guard = ""
-            if existing_keys:
-                dedupe_guard = (
-                    "\n\nAdditional rule:\n"
-                    "- Do NOT output any item whose target-language side matches (case-insensitive) any of:\n"
-                    + "\n".join([f"  - {k}" for k in existing_keys])
-                    + "\n"
-                )
+            still_missing = desired_count - len(merged)
+            if still_missing > 0:
+                # Removed items first: they must reach the guard, which also keys the cached completion.
+                existing_keys = (sorted(removed) + sorted(seen - removed))[:80]
 
-            max_tokens = 600 if current_type == "Phrases" else 400
+                system_rules = system_rules_for(
+                    meta.get("target_language", target_language),
+                    meta.get("cefr_level", cefr_level),
+                    current_type,
+                    still_missing,
+                )
 
-            with st.spinner("Topping up..."):
-                try:
-                    response = client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": system_rules + dedupe_guard},
-                            {"role": "user", "content": meta.get("topic", "") or "General"},
-                        ],
-                        temperature=0.6,
-                        max_tokens=max_tokens,
+                dedupe_guard = ""
+                if existing_keys:
+                    dedupe_guard = (
+                        "\n\nAdditional rule:\n"
+                        "- Do NOT output any item whose target-language side matches (case-insensitive) any of:\n"
+                        + "\n".join([f"  - {k}" for k in existing_keys])
+                        + "\n"
                     )
-                except Exception as e:
-                    st.error(f"OpenAI request failed: {e}")
-                    st.stop()
-
-            new_raw = response.choices[0].message.content
-            new_items = parse_items(new_raw)
-
-            merged = list(st.session_state["last_items"])
-            seen = {norm_key(i["front"]) for i in merged if i.get("front")}
-
-            for it in new_items:
-                k = norm_key(it["front"])
-                if k and k not in seen:
-                    seen.add(k)
-                    merged.append(it)
 
-            merged = merged[:desired_count]
-            st.session_state["last_items"] = merged
+                with st.spinner("Topping up..."):
+                    topic = meta.get("topic", "") or "General"
+                    preview = st.empty()
+                    try:
+                        with preview.container():
+                            (new_raw,) = _generate_raw(
+                                model_for(current_type, meta.get("cefr_level", cefr_level)),
+                                system_rules + dedupe_guard,
+                                norm_key(topic),
+                                topic,
+                                temperature=0.6,
+                                max_tokens=max_tokens_for(current_type),
+                            )
+                    except Exception as e:
+                        st.error(f"OpenAI request failed: {e}")
+                        st.stop()
+                    finally:
+                        preview.empty()
+
+                merged.extend(parse_items(new_raw, seen=seen))
+
+            del merged[desired_count:]
 
             st.session_state["card_index"] = 0
             st.session_state["show_back"] = False
@@ -265,33 +591,69 @@ with tab_generate:
 
         st.divider()
 
-        # ---- Table-like list with per-row remove ----
-        st.write("Click ➖ to remove items you already know.")
-
-        header = st.columns([3, 3, 1])
-        header[0].markdown("**Item**")
-        header[1].markdown("**Translation**")
-        header[2].markdown("**Remove**")
-
-        for i, it in enumerate(st.session_state["last_items"]):
-            r1, r2, r3 = st.columns([3, 3, 1])
-            r1.write(it["front"])
-            r2.write(it["back"])
-
-            if r3.button("➖", key=f"remove_{i}"):
-                updated = list(st.session_state["last_items"])
-                updated.pop(i)
-                st.session_state["last_items"] = updated
+        # ---- Editable table: one grid widget instead of a button per row ----
+        st.write("Tick **Remove** for items you already know (you can also edit or add rows), then apply.")
+
+        with st.form("items_form"):
+            edited = st.data_editor(
+                pd.DataFrame(
+                    {
+                        "front": [it["front"] for it in items],
+                        "back": [it["back"] for it in items],
+                        "remove": False,
+                    }
+                ),
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "front": st.column_config.TextColumn("Item", required=True),
+                    "back": st.column_config.TextColumn("Translation", required=True),
+                    "remove": st.column_config.CheckboxColumn("Remove", default=False),
+                },
+                key="items_grid",
+            )
+            apply_clicked = st.form_submit_button("Apply changes")
+
+        if apply_clicked:
+            kept = []
+            for row in edited.to_dict("records"):
+                front = row["front"].strip() if isinstance(row["front"], str) else ""
+                back = row["back"].strip() if isinstance(row["back"], str) else ""
+                if front and back and row["remove"] is not True:
+                    kept.append({"front": front, "back": back})
+
+            with_keys(kept)
+            kept_keys = {it["_key"] for it in kept}
+            removed = st.session_state["removed_keys"]
+            removed |= {it["_key"] for it in st.session_state["last_items"] if it["_key"] not in kept_keys}
+            removed -= kept_keys
+            st.session_state["last_items"] = kept
 
-                st.session_state["card_index"] = 0
-                st.session_state["show_back"] = False
+            st.session_state["card_index"] = 0
+            st.session_state["show_back"] = False
 
-                st.rerun()
+            st.rerun()
 
 
 # -------------------------
 # Flashcards tab
 # -------------------------
+# Both card colours in one constant stylesheet, so flipping never changes the injected CSS.
+# Target language side → green, English side → blue.
+_FC_CSS = """
+<style>
+.st-key-fc_front div[data-testid="stButton"] > button[kind="primary"] {
+    background-color: #16a34a !important;
+    color: white !important;
+}
+.st-key-fc_back div[data-testid="stButton"] > button[kind="primary"] {
+    background-color: #2563eb !important;
+    color: white !important;
+}
+</style>
+"""
+
 with tab_flashcards:
     st.subheader("Flashcards")
 
@@ -315,41 +677,17 @@ with tab_flashcards:
         idx = st.session_state["card_index"]
         card = items[idx]
 
-        # Colour depends on side
-        if st.session_state["show_back"]:
-            # English side → blue
-            st.markdown(
-                """
-                <style>
-                div[data-testid="stButton"] > button[kind="primary"] {
-                    background-color: #2563eb !important;
-                    color: white !important;
-                }
-                </style>
-                """,
-                unsafe_allow_html=True,
-            )
-        else:
-            # Target language side → green
-            st.markdown(
-                """
-                <style>
-                div[data-testid="stButton"] > button[kind="primary"] {
-                    background-color: #16a34a !important;
-                    color: white !important;
-                }
-                </style>
-                """,
-                unsafe_allow_html=True,
-            )
-
         card_text = card["back"] if st.session_state["show_back"] else card["front"]
         card_label = "English" if st.session_state["show_back"] else "Target language"
 
+        # Colour depends on side: the keyed container picks the rule from _FC_CSS
+        st.markdown(_FC_CSS, unsafe_allow_html=True)
+
         # Click card to flip
-        if st.button(card_text, key="fc_card", type="primary", use_container_width=True):
-            st.session_state["show_back"] = not st.session_state["show_back"]
-            st.rerun()
+        with st.container(key="fc_back" if st.session_state["show_back"] else "fc_front"):
+            if st.button(card_text, key="fc_card", type="primary", use_container_width=True):
+                st.session_state["show_back"] = not st.session_state["show_back"]
+                st.rerun()
 
         st.caption(card_label)
 
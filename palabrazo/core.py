@@ -0,0 +1,135 @@
+"""Pure helpers shared by the Streamlit app: prompt rules, output parsing and normalization."""
+
+import functools
+import re
+
+
+CEFR_LEVELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
+
+
+# -------------------------
+# Helpers
+# -------------------------
+_EM_DASH = "\u2014"
+_MIN_LINE_LEN = len("- a — b")
+_LINE_RE = re.compile(rf"^\s*-\s+(.+?)\s+{_EM_DASH}\s+(.+?)\s*$")
+
+
+def parse_items(text: str, seen: set[str] | None = None):
+    """
+    Converts model output lines like:
+    - <target> — <english>
+    into a list of dicts: [{"front": "...", "back": "...", "_key": norm_key(front)}, ...]
+    If `seen` is given, items whose key is already in it are skipped and new keys are added to it.
+    """
+    items = []
+    for line in text.splitlines():
+        # Cheap rejects first: blank/stray lines by length, then a single-character scan for
+        # the separator (without it the lazy groups would backtrack across the whole line).
+        if len(line) < _MIN_LINE_LEN or _EM_DASH not in line:
+            continue
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        front = m.group(1)
+        k = norm_key(front)
+        if not k:
+            continue
+        if seen is not None:
+            if k in seen:
+                continue
+            seen.add(k)
+        items.append({"front": front, "back": m.group(2), "_key": k})
+    return items
+
+
+@functools.lru_cache(maxsize=4096)
+def norm_key(s: str) -> str:
+    """Normalize for duplicate checks (case-insensitive, trim, collapse whitespace)."""
+    return " ".join((s or "").strip().lower().split())
+
+
+def with_keys(items):
+    """Stores norm_key(front) on each item as "_key" so duplicate checks never recompute it."""
+    for it in items:
+        it["_key"] = norm_key(it["front"])
+    return items
+
+
+def desired_count_for(generate_type: str) -> int:
+    return 10 if generate_type == "Phrases" else 20
+
+
+def next_level(cefr_level: str):
+    """The CEFR level above `cefr_level`, or None at the top."""
+    i = CEFR_LEVELS.index(cefr_level)
+    return CEFR_LEVELS[i + 1] if i + 1 < len(CEFR_LEVELS) else None
+
+
+def model_for(generate_type: str, cefr_level: str) -> str:
+    """Single words/verbs below C1 are easy enough for the cheaper, faster model."""
+    if generate_type == "Phrases" or cefr_level in ("C1", "C2"):
+        return "gpt-4o-mini"
+    return "gpt-4.1-nano"
+
+
+def max_tokens_for(generate_type: str) -> int | None:
+    """Output cap; only sentences need one, the strict line format bounds words/verbs already."""
+    return 1024 if generate_type == "Phrases" else None
+
+
+# -------------------------
+# Prompt
+# -------------------------
+SYSTEM_RULES_TEMPLATE = """
+You are a language teacher. Generate exactly {item_count} items about the user's topic.
+
+Target language: {target_language}
+CEFR level: {cefr_level}
+Generation type: {generate_type}
+
+CEFR guidance:
+- A1/A2: very common, concrete, high-frequency language.
+- B1: practical everyday language.
+- B2: more precise language; some abstraction.
+- C1/C2: advanced, nuanced language appropriate to the topic.
+
+STRICT output format:
+- Output ONLY {item_count} lines (no intro, no headings).
+- Each line MUST start with "- " (dash + space).
+- Each line MUST be: - <target language> — <English>
+- Use " — " exactly (space em-dash space). No extra text.
+- If you cannot follow the type rules, regenerate internally until you can.
+
+Type rules (apply ONLY the matching section):
+
+[WORDS]
+- Output single-word items only (one token/word, or an article + single noun).
+- Allowed formats:
+  - Noun: article + singular noun (e.g., "el libro", "la casa"). No multi-word nouns.
+  - Verb/adjective/adverb: single word only. No article.
+- NOT allowed: phrases, collocations, multi-word items, sentences, punctuation.
+
+[VERBS]
+- Output infinitive verbs only, single word (e.g., "hablar", "comer").
+- NOT allowed: any nouns, any sentences, any multi-word items.
+
+[PHRASES]
+- Output complete, useful sentences a learner would actually say (8–14 words).
+- Each item MUST contain a verb and end with punctuation (., ?, !).
+- NOT allowed: single words, noun-only entries.
+
+Quality rules:
+- Avoid English loanwords unless they are the most common term in the target language.
+- Keep items relevant to the topic and appropriate to the CEFR level.
+"""
+
+
+@functools.lru_cache(maxsize=256)
+def system_rules_for(target_language: str, cefr_level: str, generate_type: str, item_count: int) -> str:
+    return SYSTEM_RULES_TEMPLATE.format(
+        target_language=target_language,
+        cefr_level=cefr_level,
+        generate_type=generate_type,
+        item_count=item_count,
+    )